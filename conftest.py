@@ -0,0 +1,14 @@
+import os
+import shutil
+import tempfile
+
+# validador_api_v5 cria logs/, resultados/ e .http_cache/ no diretório atual
+# ao ser importado: os testes rodam num diretório temporário.
+_ORIGINAL_CWD = os.getcwd()
+_WORKDIR = tempfile.mkdtemp(prefix="validador_tests_")
+os.chdir(_WORKDIR)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    os.chdir(_ORIGINAL_CWD)
+    shutil.rmtree(_WORKDIR, ignore_errors=True)
@@ -0,0 +1,135 @@
+import asyncio
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import validador_api_v5 as v
+
+NAMES = ["Leanne Graham", "Ervin Howell", "Mrs. Dennis Schulist", "Jo$é 9", "Clementine Bauch", ""]
+EMAILS = [
+    "Sincere@april.biz", "Shanna@melissa.tv", "leanne.g@x.io", "x@mailinator.com",
+    "x@MAILINATOR.com", "a@" + "b" * 31 + ".com", "a@" + "b" * 26 + ".com",
+    "bad@@x", "@x.com", "noat", "",
+]
+CATEGORIES = ["electronics", "Jewelery", "men's clothing", "women's clothing", "other", ""]
+PRICES = [0, 10, 49.99, 50, 99.9, 100, 499, 500, 1000, float("nan")]
+
+
+def _pairs(n=3000, seed=1):
+    rng = random.Random(seed)
+    users, products = [], []
+    for i in range(n):
+        users.append({
+            "id": rng.randint(0, 500),
+            "name": rng.choice(NAMES),
+            "email": rng.choice(EMAILS),
+            "address": {"city": "Gwenborough"},
+        })
+        products.append({
+            "id": i,
+            "title": "Produto",
+            "price": rng.choice(PRICES),
+            "category": rng.choice(CATEGORIES),
+        })
+    return users, products
+
+
+_EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+
+
+def test_validar_email_matches_previous_regex():
+    rng = random.Random(3)
+    alphabet = "ab.@-_+9Z é"
+    for _ in range(20000):
+        email = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 9)))
+        assert v.validar_email(email) == bool(_EMAIL_PATTERN.match(email)), email
+    for email in EMAILS:
+        assert v.validar_email(email) == bool(_EMAIL_PATTERN.match(email)), email
+
+
+def test_validar_email_rejects_trailing_newline():
+    # O regex antigo aceitava "\n" final (via "$"); o parser não aceita
+    assert _EMAIL_PATTERN.match("a@b.c\n")
+    assert not v.validar_email("a@b.c\n")
+
+
+def test_bulk_matches_scalar_dataframes():
+    users, products = _pairs()
+    expected = [v.compute_risk_score(u, p)[0] for u, p in zip(users, products)]
+    bulk = v.compute_risk_scores_bulk(pd.DataFrame(users), pd.DataFrame(products))
+    assert bulk.tolist() == expected
+
+
+def test_bulk_matches_scalar_soa():
+    users, products = _pairs(seed=2)
+    expected = [v.compute_risk_score(u, p)[0] for u, p in zip(users, products)]
+    bulk = v.compute_risk_scores_bulk(v.build_users_soa(users), v.build_products_soa(products))
+    assert bulk.tolist() == expected
+
+
+def test_nan_price_scores_as_low():
+    user = {"id": 1, "name": "Leanne Graham", "email": "Sincere@april.biz"}
+    product = {"price": float("nan"), "category": "electronics"}
+    assert v.price_risk(float("nan")) == (0, "Preço baixo")
+    expected = v.compute_risk_score(user, product)[0]
+    bulk = v.compute_risk_scores_bulk(pd.DataFrame([user]), pd.DataFrame([product]))
+    assert bulk.tolist() == [expected]
+
+
+def test_bulk_empty():
+    assert len(v.compute_risk_scores_bulk(v.build_users_soa([]), v.build_products_soa([]))) == 0
+
+
+def test_gerar_cpf_fake_accepts_any_id():
+    assert v.gerar_cpf_fake(1) == "436.045.029-00"
+    assert v.gerar_cpf_fake(2**64 + 1) == v.gerar_cpf_fake(1)
+    for uid in (None, "abc", "7", 2**70, -1, 3.5):
+        assert len(v.gerar_cpf_fake(uid)) == 14
+    assert v.gerar_cpf_fake("abc") == v.gerar_cpf_fake("abc")
+    # Só inteiros viram semente direta; texto e float passam pelo hash
+    assert v.gerar_cpf_fake(np.int64(7)) == v.gerar_cpf_fake(7)
+    assert v.gerar_cpf_fake("7") != v.gerar_cpf_fake(7)
+    assert v.gerar_cpf_fake(3.5) != v.gerar_cpf_fake(3)
+
+
+def test_validate_batch_dedupes_and_counts_files(tmp_path, monkeypatch):
+    users, products = _pairs(n=3)
+    monkeypatch.setattr(v, "_USERS_CACHE", {u["id"]: u for u in users})
+    monkeypatch.setattr(v, "_PRODUCTS_CACHE", {p["id"]: p for p in products})
+    monkeypatch.setattr(v, "_RESULT_PREFIX", f"{tmp_path}/")
+    uid = users[0]["id"]
+    pairs = [(uid, 0), (uid, 1), (uid, 0), (uid, 1), (uid, 99)]
+    assert asyncio.run(v.validate_batch(pairs)) == 2
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(0.5)
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b"[]")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_fetch_api_reports_read_timeout_after_retries(monkeypatch, capsys):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        monkeypatch.setattr(v, "REQUEST_TIMEOUT", 0.1)
+        url = f"http://127.0.0.1:{server.server_port}/users?t={time.time_ns()}"
+        assert v.fetch_api(url) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+    out = capsys.readouterr().out
+    assert "Timeout ao acessar" in out
+    assert "Erro de requisição" not in out
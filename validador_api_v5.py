@@ -6,15 +6,30 @@ Autor: Vitor Santos
 Versão: 5.0 (com camada antifraude simulada)
 """
 
+import asyncio
+import aiofiles
+import argparse
+import diskcache
+import hashlib
+import numpy as np
+import orjson
+import pandas as pd
 import requests
-import time
-import json
+from requests.adapters import HTTPAdapter
+from urllib3 import exceptions as urllib3_exceptions
+from urllib3.util import Retry
 import logging
+import math
+import os
 import re
+import sys
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict
 from datetime import datetime
-from random import Random
+from numba import njit
 
 # ============================
 # CONFIGURAÇÕES E CONSTANTES
@@ -27,6 +42,11 @@ LOG_DIR = Path("logs")
 RESULT_DIR = Path("resultados")
 LOG_DIR.mkdir(exist_ok=True)
 RESULT_DIR.mkdir(exist_ok=True)
+_RESULT_PREFIX = str(RESULT_DIR) + os.sep  # evita aritmética de Path a cada gravação
+
+# Cache em disco das respostas HTTP (chave = URL), válido entre execuções
+CACHE = diskcache.Cache(".http_cache")
+CACHE_EXPIRE = 3600  # segundos
 
 logging.basicConfig(
     filename=LOG_DIR / "integracao.log",
@@ -37,6 +57,13 @@ logging.basicConfig(
 # Risco acima deste valor => bloqueia integração
 RISK_THRESHOLD = 70
 
+# Máximo de gravações simultâneas no modo em lote
+SAVE_CONCURRENCY = 20
+
+# Padrões compilados uma única vez
+_NONDIGIT_RE = re.compile(r"\D")
+_NAME_BAD_RE = re.compile(r"[^A-Za-zÀ-ÿ \-\.]")
+
 # ============================
 # CORES PARA O TERMINAL
 # ============================
@@ -49,104 +76,243 @@ class Colors:
     RESET = "\033[0m"
     BOLD = "\033[1m"
 
+# Sem terminal (saída redirecionada / modo em lote) => sem códigos ANSI
+USE_COLOR = sys.stdout.isatty()
+if not USE_COLOR:
+    for _name in ("GREEN", "RED", "YELLOW", "CYAN", "RESET", "BOLD"):
+        setattr(Colors, _name, "")
+
+# Modelo do resumo, com as cores já aplicadas
+_SUMMARY_TEMPLATE = (
+    f"\n{Colors.BOLD}{Colors.GREEN}👤 Usuário:{Colors.RESET} {{name}} | {{email}}\n"
+    f"{Colors.CYAN}🏙️ Cidade:{Colors.RESET} {{city}}\n"
+    f"\n{Colors.BOLD}{Colors.GREEN}✅ Produto:{Colors.RESET} {{title}}\n"
+    f"{Colors.CYAN}💲 Preço:{Colors.RESET} R${{price}} | Categoria: {{category}}\n"
+    f"\n{Colors.YELLOW}🔎 Pontuação de risco: {{risk}}/100{Colors.RESET}\n"
+)
+_REASONS_TEMPLATE = f"{Colors.YELLOW}📋 Motivos: {{reasons}}{Colors.RESET}\n"
+_BLOCKED_MSG = f"{Colors.RED}\n⛔ Integração BLOQUEADA — risco acima do limiar ({RISK_THRESHOLD}).{Colors.RESET}\n"
+_AUTHORIZED_MSG = f"{Colors.GREEN}\n🎉 Integração autorizada — prosseguindo com salvamento.{Colors.RESET}\n"
+
 # ============================
 # UTILITÁRIOS DE REDE
 # ============================
 
-def fetch_api(url: str, retries: int = 3, delay: float = 1.0) -> Optional[dict]:
-    """Requisição HTTP com timeout e retry."""
-    for attempt in range(1, retries + 1):
-        try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.Timeout:
-            print(f"{Colors.YELLOW}⏳ Timeout ({attempt}/{retries}), tentando...{Colors.RESET}")
-            time.sleep(delay)
-        except requests.exceptions.RequestException as e:
+REQUEST_TIMEOUT = 5  # segundos, por tentativa
+
+# Sessão compartilhada: reaproveita conexões keep-alive (sem novo handshake TLS por chamada)
+SESSION = requests.Session()
+# Retry em nível de transporte: backoff exponencial, respeita Retry-After (429)
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    respect_retry_after_header=True,
+)
+_ADAPTER = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_RETRY)
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+
+def _is_timeout(error: requests.exceptions.RequestException) -> bool:
+    """Timeout direto ou timeout que esgotou o Retry (requests o entrega como ConnectionError)."""
+    if isinstance(error, requests.exceptions.Timeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, urllib3_exceptions.TimeoutError)
+
+def fetch_api(url: str) -> Optional[List[dict]]:
+    """Requisição HTTP com timeout, retry (via sessão) e cache em disco por URL."""
+    cached = CACHE.get(url)
+    if cached is not None:
+        return cached
+    try:
+        response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        CACHE.set(url, data, expire=CACHE_EXPIRE)
+        return data
+    except requests.exceptions.RequestException as e:
+        if _is_timeout(e):
+            print(f"{Colors.YELLOW}⏳ Timeout ao acessar {url}.{Colors.RESET}")
+            logging.error(f"Timeout ao acessar {url}")
+        else:
             print(f"{Colors.RED}❌ Erro de requisição: {e}{Colors.RESET}")
             logging.error(f"Erro ao acessar {url}: {e}")
-            break
+    except orjson.JSONDecodeError as e:
+        print(f"{Colors.RED}❌ Resposta JSON inválida: {e}{Colors.RESET}")
+        logging.error(f"JSON inválido em {url}: {e}")
     return None
 
+# Listas completas carregadas uma única vez (id -> registro)
+_USERS_CACHE: Dict[int, dict] = {}
+_PRODUCTS_CACHE: Dict[int, dict] = {}
+
+def _load_all(url: str, cache: Dict[int, dict]) -> Dict[int, dict]:
+    """Preenche o cache com o endpoint de listagem na primeira chamada."""
+    if not cache:
+        records = fetch_api(url) or []
+        cache.update({r["id"]: r for r in records if "id" in r})
+    return cache
+
+# Modo em lote: um array NumPy por campo (Structure-of-Arrays). Campos
+# numéricos são tipados; textos ficam como object, que é o que o pandas
+# usa nas operações de string (sem cópia em compute_risk_scores_bulk).
+UsersSoA = namedtuple("UsersSoA", "id name email city")
+ProductsSoA = namedtuple("ProductsSoA", "id title price category")
+
+def build_users_soa(users: List[dict]) -> UsersSoA:
+    """Converte a lista de usuários em UsersSoA (um array por campo)."""
+    return UsersSoA(
+        np.array([u.get("id", 0) for u in users], dtype=np.int64),
+        np.array([u.get("name") or "" for u in users], dtype=object),
+        np.array([u.get("email") or "" for u in users], dtype=object),
+        np.array([(u.get("address") or {}).get("city") or "" for u in users], dtype=object),
+    )
+
+def build_products_soa(products: List[dict]) -> ProductsSoA:
+    """Converte a lista de produtos em ProductsSoA (um array por campo)."""
+    return ProductsSoA(
+        np.array([p.get("id", 0) for p in products], dtype=np.int64),
+        np.array([p.get("title") or "" for p in products], dtype=object),
+        np.array([float(p.get("price", 0) or 0) for p in products], dtype=np.float64),
+        np.array([p.get("category") or "" for p in products], dtype=object),
+    )
+
+def load_bulk() -> Tuple[UsersSoA, ProductsSoA]:
+    """Carrega as listas completas (uma requisição cada) já em formato SoA."""
+    users = _load_all(USERS_API, _USERS_CACHE)
+    products = _load_all(PRODUCTS_API, _PRODUCTS_CACHE)
+    return build_users_soa(list(users.values())), build_products_soa(list(products.values()))
+
 def get_user(user_id: int) -> Optional[dict]:
-    print(f"{Colors.CYAN}\n🔍 Consultando usuário ID={user_id}...{Colors.RESET}")
-    user = fetch_api(f"{USERS_API}/{user_id}")
-    if not user:
-        print(f"{Colors.RED}⚠️ Usuário não encontrado.{Colors.RESET}")
-    return user
+    return _load_all(USERS_API, _USERS_CACHE).get(user_id)
 
 def get_product(product_id: int) -> Optional[dict]:
-    print(f"{Colors.CYAN}🛒 Buscando produto ID={product_id}...{Colors.RESET}")
-    product = fetch_api(f"{PRODUCTS_API}/{product_id}")
-    if not product:
-        print(f"{Colors.RED}⚠️ Produto não encontrado.{Colors.RESET}")
-    return product
+    return _load_all(PRODUCTS_API, _PRODUCTS_CACHE).get(product_id)
 
 # ============================
 # VALIDAÇÃO DE E-MAIL E CPF
 # ============================
 
-def validar_email(email: str) -> bool:
-    pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
-    return bool(re.match(pattern, email))
+# Classes de caracteres aceitas em cada parte do e-mail
+_ALNUM = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789")
+_LOCAL_OK = _ALNUM | frozenset("_.+-")
+_DOMAIN_OK = _ALNUM | frozenset("-.")
 
-def gerar_cpf_fake(user_id: int) -> str:
-    """Gera CPF fictício determinístico a partir do user_id (reprodutível)."""
-    rng = Random(user_id)  # determinístico conforme user_id
-    base = [rng.randint(0, 9) for _ in range(9)]
-    soma = sum(base[i] * (10 - i) for i in range(9))
+def validar_email(email: str) -> bool:
+    """Valida local@rotulo.resto sem regex (varredura direta dos caracteres)."""
+    i = email.rfind("@")
+    if i < 1:
+        return False
+    local, domain = email[:i], email[i + 1:]
+    dot = domain.find(".")
+    return (
+        0 < dot < len(domain) - 1
+        and _LOCAL_OK.issuperset(local)
+        and _DOMAIN_OK.issuperset(domain)
+    )
+
+# LCG de 64 bits (constantes de Knuth/PCG) — compatível com Numba
+_LCG_MUL = np.uint64(6364136223846793005)
+_LCG_INC = np.uint64(1442695040888963407)
+
+@njit(cache=True)
+def _cpf_digits(seed):
+    """Os 11 dígitos do CPF (9 base + 2 verificadores) derivados da semente."""
+    digits = np.empty(11, dtype=np.int64)
+    x = np.uint64(seed)
+    for i in range(9):
+        x = x * _LCG_MUL + _LCG_INC
+        digits[i] = (x >> np.uint64(33)) % np.uint64(10)
+    soma = 0
+    for i in range(9):
+        soma += digits[i] * (10 - i)
     dig1 = (soma * 10) % 11
-    dig1 = 0 if dig1 == 10 else dig1
-    soma = sum(base[i] * (11 - i) for i in range(9)) + dig1 * 2
+    digits[9] = 0 if dig1 == 10 else dig1
+    soma = 0
+    for i in range(9):
+        soma += digits[i] * (11 - i)
+    soma += digits[9] * 2
     dig2 = (soma * 10) % 11
-    dig2 = 0 if dig2 == 10 else dig2
-    cpf = "".join(map(str, base)) + f"{dig1}{dig2}"
-    return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+    digits[10] = 0 if dig2 == 10 else dig2
+    return digits
+
+@njit(cache=True)
+def _cpf_last_digits(seeds):
+    """Último dígito verificador para um lote de sementes."""
+    out = np.empty(seeds.shape[0], dtype=np.int64)
+    for i in range(seeds.shape[0]):
+        out[i] = _cpf_digits(seeds[i])[10]
+    return out
+
+_CPF_FMT = "%d%d%d.%d%d%d.%d%d%d-%d%d"
+_U64_MASK = 0xFFFF_FFFF_FFFF_FFFF
+
+def _cpf_seed(user_id) -> np.uint64:
+    """Semente uint64 para o kernel: inteiros módulo 2**64; demais valores via hash estável do texto."""
+    if isinstance(user_id, (int, np.integer)):
+        return np.uint64(int(user_id) & _U64_MASK)
+    digest = hashlib.blake2b(str(user_id).encode(), digest_size=8).digest()
+    return np.uint64(int.from_bytes(digest, "little"))
+
+@lru_cache(maxsize=256)
+def gerar_cpf_fake(user_id: int) -> str:
+    """Gera CPF fictício determinístico a partir do user_id (reprodutível)."""
+    return _CPF_FMT % tuple(_cpf_digits(_cpf_seed(user_id)).tolist())
 
 # ============================
 # CAMADA ANTIFRAUDE (SIMULADA)
 # ============================
 
+# Chaves já em minúsculas
+CATEGORY_RISK = {
+    "electronics": 30,
+    "jewelery": 40,
+    "men's clothing": 10,
+    "women's clothing": 10,
+}
+CATEGORY_RISK_DEFAULT = 15
+
+SUSPICIOUS_DOMAINS = frozenset({"mailinator.com", "tempmail.com", "10minutemail.com", "disposablemail.com"})
+
+# Faixas (limiares ordenados -> resultado), resolvidas com bisect
+_DOMAIN_LEN_TH = [31]
+_DOMAIN_LEN_OUT = [(0, "E-mail com domínio comum"), (10, "Domínio muito longo (suspeito)")]
+_PRICE_TH = [50, 100, 500]
+_PRICE_OUT = [(0, "Preço baixo"), (10, "Preço moderado"), (20, "Preço elevado"), (35, "Preço muito alto")]
+# Mesmas faixas, só as pontuações (modo em lote via np.searchsorted)
+_DOMAIN_LEN_SCORES = np.array([score for score, _ in _DOMAIN_LEN_OUT], dtype=np.int64)
+_PRICE_SCORES = np.array([score for score, _ in _PRICE_OUT], dtype=np.int64)
+
+@lru_cache(maxsize=64)
+def _category_risk_cached(category: str) -> int:
+    return CATEGORY_RISK.get(category.lower(), CATEGORY_RISK_DEFAULT)
+
 def category_risk(category: str) -> int:
     """Risco associado a categorias (mapeamento simples)."""
-    cat = (category or "").lower()
-    mapping = {
-        "electronics": 30,
-        "jewelery": 40,
-        "men's clothing": 10,
-        "women's clothing": 10,
-    }
-    return mapping.get(cat, 15)  # default 15
+    return _category_risk_cached(category or "")
 
-def email_risk(email: str) -> Tuple[int, str]:
-    """Avalia risco do e-mail; retorna (pontuação, motivo)."""
-    suspicious_domains = {"mailinator.com", "tempmail.com", "10minutemail.com", "disposablemail.com"}
-    try:
-        domain = email.split("@", 1)[1].lower()
-    except Exception:
+def email_risk(domain: str) -> Tuple[int, str]:
+    """Avalia risco do domínio do e-mail; retorna (pontuação, motivo)."""
+    if not domain:
         return 40, "E-mail malformado"
 
-    if domain in suspicious_domains:
+    domain = domain.lower()
+    if domain in SUSPICIOUS_DOMAINS:
         return 50, f"Domínio descartável ({domain})"
-    if len(domain) > 30:
-        return 10, "Domínio muito longo (suspeito)"
-    return 0, "E-mail com domínio comum"
+    return _DOMAIN_LEN_OUT[bisect_right(_DOMAIN_LEN_TH, len(domain))]
 
 def price_risk(price: float) -> Tuple[int, str]:
     """Influência do preço na pontuação de risco."""
-    if price >= 500:
-        return 35, "Preço muito alto"
-    if price >= 100:
-        return 20, "Preço elevado"
-    if price >= 50:
-        return 10, "Preço moderado"
-    return 0, "Preço baixo"
+    if math.isnan(price):  # preço ausente/inválido conta como baixo (igual ao modo em lote)
+        return _PRICE_OUT[0]
+    return _PRICE_OUT[bisect_right(_PRICE_TH, price)]
 
 def cpf_risk(cpf: str) -> Tuple[int, str]:
     """Avalia o CPF gerado: regras simples (simulação)."""
     # Exemplo: CPF cujo último dígito é ímpar = um pouco mais arriscado
-    last_digit = int(re.sub(r'\D', '', cpf)[-1])
+    last_digit = int(_NONDIGIT_RE.sub('', cpf)[-1])
     if last_digit % 2 == 1:
         return 25, "CPF simulado termina em dígito ímpar (simulado)"
     return 0, "CPF simulado com padrão aceitável"
@@ -162,13 +328,16 @@ def compute_risk_score(user: dict, product: dict) -> Tuple[int, List[str]]:
     motivos: List[str] = []
     score = 10  # base
 
-    # Email
-    email = user.get("email", "")
+    # Email (separado uma única vez em parte local e domínio)
+    email = user.get("email", "") or ""
+    at_idx = email.find("@")
+    local = email[:at_idx] if at_idx >= 0 else ""
+    domain = email[at_idx + 1:] if at_idx >= 0 else ""
     if not validar_email(email):
         motivos.append("E-mail inválido/formatado incorretamente")
         score += 40
     else:
-        erisk, emot = email_risk(email)
+        erisk, emot = email_risk(domain)
         if erisk:
             motivos.append(emot)
         score += erisk
@@ -197,14 +366,13 @@ def compute_risk_score(user: dict, product: dict) -> Tuple[int, List[str]]:
     # Heurísticos adicionais (simulados)
     # - Se nome do usuário contém muitos caracteres especiais -> acrescenta risco
     name = user.get("name", "")
-    if len(re.findall(r'[^A-Za-zÀ-ÿ \-\.]', name)) > 0:
+    if _NAME_BAD_RE.search(name):
         motivos.append("Nome do usuário contém caracteres incomuns")
         score += 8
 
     # - Se e-mail e nome não compartilham domínio/parte reconhecível -> pequeno risco
-    if "@" in email:
-        local = email.split("@")[0]
-        if local.split(".")[0].lower() not in name.replace(".", " ").lower():
+    if at_idx >= 0:
+        if local.split(".", 1)[0].lower() not in name.replace(".", " ").lower():
             motivos.append("Nome e parte local do e-mail não coincidem (heurística)")
             score += 5
 
@@ -215,12 +383,76 @@ def compute_risk_score(user: dict, product: dict) -> Tuple[int, List[str]]:
 
     return final, motivos
 
+def _factorize(values) -> Tuple[np.ndarray, List[str]]:
+    """Códigos inteiros por linha + valores distintos (não-texto vira "")."""
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=False)
+    return codes, [u if isinstance(u, str) else "" for u in uniques]
+
+def compute_risk_scores_bulk(users, products) -> np.ndarray:
+    """
+    Versão vetorizada de compute_risk_score para muitos pares (posição i de
+    users com posição i de products). Aceita UsersSoA/ProductsSoA ou
+    DataFrames com as mesmas colunas. Retorna apenas as pontuações,
+    idênticas às da versão escalar.
+
+    As regras de texto rodam uma vez por valor distinto (e-mail, nome,
+    categoria) e são espalhadas para as linhas por indexação NumPy.
+    """
+    n = len(users.email)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    prices = np.nan_to_num(np.asarray(products.price, dtype=np.float64))
+
+    # Email: separado uma única vez em parte local / domínio
+    e_codes, e_uniq = _factorize(users.email)
+    parts = pd.Series(e_uniq, dtype=object).str.partition("@")
+    has_at_u = (parts[1] != "").to_numpy()
+    domains_u = parts[2].str.lower()
+    first_local_u = parts[0].str.partition(".")[0].str.lower().tolist()
+    valid_u = np.fromiter(map(validar_email, e_uniq), dtype=bool, count=len(e_uniq))
+    dom_len_u = _DOMAIN_LEN_SCORES[np.searchsorted(_DOMAIN_LEN_TH, domains_u.str.len().to_numpy(), side="right")]
+    email_u = np.where(~valid_u, 40, np.where(domains_u.isin(SUSPICIOUS_DOMAINS).to_numpy(), 50, dom_len_u))
+
+    # Nome
+    n_codes, n_uniq = _factorize(users.name)
+    names_u = pd.Series(n_uniq, dtype=object)
+    bad_name_u = names_u.str.contains(_NAME_BAD_RE).to_numpy(dtype=bool)
+    name_norm_u = names_u.str.replace(".", " ", regex=False).str.lower().tolist()
+
+    # Heurística nome x e-mail: uma avaliação por par (e-mail, nome) distinto
+    pair_uniq, pair_inv = np.unique(e_codes.astype(np.int64) * len(n_uniq) + n_codes, return_inverse=True)
+    mismatch_u = np.fromiter(
+        (has_at_u[e] and first_local_u[e] not in name_norm_u[k]
+         for e, k in zip(*np.divmod(pair_uniq, len(n_uniq)))),
+        dtype=bool, count=len(pair_uniq),
+    )
+
+    # CPF (simulado): uma semente por id distinto
+    id_codes, id_uniq = pd.factorize(np.asarray(users.id, dtype=object), use_na_sentinel=False)
+    seeds_u = np.array([_cpf_seed(u) for u in id_uniq], dtype=np.uint64)
+    cpf_last_u = _cpf_last_digits(seeds_u)
+
+    # Categoria
+    c_codes, c_uniq = _factorize(products.category)
+    category_u = np.array([category_risk(c) for c in c_uniq], dtype=np.int64)
+
+    score = np.full(n, 10, dtype=np.int64)  # base
+    score += email_u[e_codes]
+    score += np.where(cpf_last_u[id_codes] % 2 == 1, 25, 0)  # CPF (simulado): último dígito ímpar
+    score += category_u[c_codes]
+    score += _PRICE_SCORES[np.searchsorted(_PRICE_TH, prices, side="right")]
+    score += np.where(bad_name_u[n_codes], 8, 0)
+    score += np.where(mismatch_u[pair_inv], 5, 0)
+
+    return np.clip(score, 0, 100)
+
 # ============================
 # SALVAMENTO E LOGS
 # ============================
 
-def save_result(user: dict, product: dict, risk: int, reasons: List[str], blocked: bool):
-    """Salva resultado incluindo pontuação antifraude e motivo(s)."""
+def _build_result(user: dict, product: dict, risk: int, reasons: List[str], blocked: bool) -> Tuple[str, bytes]:
+    """Monta (arquivo de destino, JSON serializado) de um resultado."""
     data = {
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "user": {
@@ -242,9 +474,29 @@ def save_result(user: dict, product: dict, risk: int, reasons: List[str], blocke
         }
     }
 
-    filename = RESULT_DIR / f"user{user['id']}_product{product['id']}_result.json"
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    filename = f"{_RESULT_PREFIX}user{user['id']}_product{product['id']}_result.json"
+    return filename, orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+def save_result(user: dict, product: dict, risk: int, reasons: List[str], blocked: bool):
+    """Salva resultado incluindo pontuação antifraude e motivo(s)."""
+    filename, payload = _build_result(user, product, risk, reasons, blocked)
+    # O_BINARY (Windows): sem conversão de "\n" em "\r\n", igual ao caminho assíncrono
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(filename, flags, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+    logging.info(f"Resultado salvo: {filename} | risk={risk} | blocked={blocked}")
+
+async def save_result_async(user: dict, product: dict, risk: int, reasons: List[str], blocked: bool):
+    """Versão assíncrona de save_result (não bloqueia o event loop)."""
+    filename, payload = _build_result(user, product, risk, reasons, blocked)
+    async with aiofiles.open(filename, "wb") as f:
+        await f.write(payload)
 
     logging.info(f"Resultado salvo: {filename} | risk={risk} | blocked={blocked}")
 
@@ -252,15 +504,23 @@ def save_result(user: dict, product: dict, risk: int, reasons: List[str], blocke
 # VALIDAÇÃO INTEGRADA
 # ============================
 
-def validate_integration(user_id: int, product_id: int):
+async def validate_integration(user_id: int, product_id: int):
     """Fluxo principal com antifraude."""
-    user = get_user(user_id)
+    print(f"{Colors.CYAN}\n🔍 Consultando usuário ID={user_id}...{Colors.RESET}")
+    print(f"{Colors.CYAN}🛒 Buscando produto ID={product_id}...{Colors.RESET}")
+
+    # Usuário e produto são independentes: as duas consultas rodam em paralelo
+    user, product = await asyncio.gather(
+        asyncio.to_thread(get_user, user_id),
+        asyncio.to_thread(get_product, product_id),
+    )
     if not user:
+        print(f"{Colors.RED}⚠️ Usuário não encontrado.{Colors.RESET}")
         logging.warning(f"Usuário {user_id} não encontrado.")
         return
 
-    product = get_product(product_id)
     if not product:
+        print(f"{Colors.RED}⚠️ Produto não encontrado.{Colors.RESET}")
         logging.warning(f"Produto {product_id} não encontrado.")
         return
 
@@ -268,26 +528,59 @@ def validate_integration(user_id: int, product_id: int):
     risk, reasons = compute_risk_score(user, product)
     blocked = risk >= RISK_THRESHOLD
 
-    # Exibe resumo
-    print(f"\n{Colors.BOLD}{Colors.GREEN}👤 Usuário:{Colors.RESET} {user['name']} | {user['email']}")
-    print(f"{Colors.CYAN}🏙️ Cidade:{Colors.RESET} {user['address']['city']}")
-    print(f"\n{Colors.BOLD}{Colors.GREEN}✅ Produto:{Colors.RESET} {product['title']}")
-    print(f"{Colors.CYAN}💲 Preço:{Colors.RESET} R${product['price']} | Categoria: {product.get('category','-')}")
-    print(f"\n{Colors.YELLOW}🔎 Pontuação de risco: {risk}/100{Colors.RESET}")
-
+    # Exibe resumo (uma única escrita no stdout)
+    out = [_SUMMARY_TEMPLATE.format(
+        name=user['name'], email=user['email'], city=user['address']['city'],
+        title=product['title'], price=product['price'],
+        category=product.get('category', '-'), risk=risk,
+    )]
     if reasons:
-        print(f"{Colors.YELLOW}📋 Motivos: {', '.join(reasons)}{Colors.RESET}")
+        out.append(_REASONS_TEMPLATE.format(reasons=', '.join(reasons)))
 
     if blocked:
-        print(f"{Colors.RED}\n⛔ Integração BLOQUEADA — risco acima do limiar ({RISK_THRESHOLD}).{Colors.RESET}")
+        out.append(_BLOCKED_MSG)
         logging.warning(f"Integração bloqueada — user={user_id} product={product_id} risk={risk}")
     else:
-        print(f"{Colors.GREEN}\n🎉 Integração autorizada — prosseguindo com salvamento.{Colors.RESET}")
+        out.append(_AUTHORIZED_MSG)
         logging.info(f"Integração autorizada — user={user_id} product={product_id} risk={risk}")
+    sys.stdout.write("".join(out))
 
     # Salva resultado com detalhe de risco (mesmo quando bloqueado)
     save_result(user, product, risk, reasons, blocked)
 
+async def validate_batch(pairs: List[Tuple[int, int]]) -> int:
+    """
+    Valida muitos pares (user_id, product_id) sem saída no terminal e grava
+    os resultados concorrentemente (no máximo SAVE_CONCURRENCY arquivos
+    abertos ao mesmo tempo). Pares repetidos são avaliados uma única vez.
+    Retorna quantos arquivos foram gravados.
+    """
+    # Download das listas fora do event loop; depois disso só consultas em memória
+    await asyncio.gather(
+        asyncio.to_thread(_load_all, USERS_API, _USERS_CACHE),
+        asyncio.to_thread(_load_all, PRODUCTS_API, _PRODUCTS_CACHE),
+    )
+
+    sem = asyncio.Semaphore(SAVE_CONCURRENCY)
+    written = 0
+
+    async def bounded_save(*args):
+        nonlocal written
+        async with sem:
+            await save_result_async(*args)
+        written += 1
+
+    saves = []
+    for user_id, product_id in dict.fromkeys(pairs):
+        user, product = _USERS_CACHE.get(user_id), _PRODUCTS_CACHE.get(product_id)
+        if not user or not product:
+            logging.warning(f"Par ignorado — user={user_id} product={product_id} não encontrado.")
+            continue
+        risk, reasons = compute_risk_score(user, product)
+        saves.append(bounded_save(user, product, risk, reasons, risk >= RISK_THRESHOLD))
+    await asyncio.gather(*saves)
+    return written
+
 # ============================
 # UI / MENU
 # ============================
@@ -301,13 +594,55 @@ def show_header():
     print(f"🔹 Limiar de bloqueio (RISK_THRESHOLD) = {RISK_THRESHOLD}")
     print("=" * 80)
 
+def show_risk_matrix():
+    """Pontua todos os pares usuário × produto de uma vez (modo vetorizado) e exibe o resumo."""
+    users, products = load_bulk()
+    n_users, n_products = len(users.id), len(products.id)
+    if not n_users or not n_products:
+        print(f"{Colors.RED}⚠️ Não foi possível carregar usuários/produtos.{Colors.RESET}")
+        return
+
+    # Produto cartesiano em SoA: cada usuário repetido para todos os produtos
+    pair_users = UsersSoA(*(np.repeat(col, n_products) for col in users))
+    pair_products = ProductsSoA(*(np.tile(col, n_users) for col in products))
+    scores = compute_risk_scores_bulk(pair_users, pair_products)
+    blocked = int((scores >= RISK_THRESHOLD).sum())
+
+    print(f"\n{Colors.BOLD}📊 Matriz de risco: {n_users} usuários × {n_products} produtos = {scores.size} pares{Colors.RESET}")
+    print(f"{Colors.CYAN}🔎 Pontuação média: {scores.mean():.1f} | mín: {scores.min()} | máx: {scores.max()}{Colors.RESET}")
+    print(f"{Colors.RED}⛔ Bloqueados: {blocked}{Colors.RESET} | {Colors.GREEN}🎉 Autorizados: {scores.size - blocked}{Colors.RESET}")
+
+def run_batch():
+    """Valida e salva todos os pares usuário × produto, sem menu."""
+    users = _load_all(USERS_API, _USERS_CACHE)
+    products = _load_all(PRODUCTS_API, _PRODUCTS_CACHE)
+    if not users or not products:
+        print(f"{Colors.RED}⚠️ Não foi possível carregar usuários/produtos.{Colors.RESET}")
+        return
+    pairs = [(user_id, product_id) for user_id in users for product_id in products]
+    written = asyncio.run(validate_batch(pairs))
+    print(f"\n{Colors.GREEN}💾 {written} resultados salvos em {RESULT_DIR}/{Colors.RESET}")
+
 def main():
+    parser = argparse.ArgumentParser(description="Validação de integração entre APIs com camada antifraude.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--lote", action="store_true", help="valida e salva todos os pares usuário × produto")
+    mode.add_argument("--matriz", action="store_true", help="exibe o resumo de risco de todos os pares")
+    args = parser.parse_args()
+
     show_header()
+    if args.lote:
+        run_batch()
+        return
+    if args.matriz:
+        show_risk_matrix()
+        return
+
     while True:
         try:
             user_id = int(input(f"\nDigite o ID do usuário (1–10): "))
             product_id = int(input("Digite o ID do produto (1–20): "))
-            validate_integration(user_id, product_id)
+            asyncio.run(validate_integration(user_id, product_id))
         except ValueError:
             print(f"{Colors.YELLOW}⚠️ Digite apenas números válidos!{Colors.RESET}")
             continue